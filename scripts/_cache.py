@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Disk-backed LRU cache for Parallel.ai task results.
+
+Keyed by a hash of the normalized request payload so identical research
+queries (same processor, input, task_spec and domain filters) short-circuit
+to the prior result instead of re-running minutes of Parallel.ai compute.
+
+Requires the optional `diskcache` package; without it every lookup misses
+and stores are no-ops, so the CLI works unchanged.
+"""
+
+import hashlib
+import json
+import os
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+CACHE_DIR = os.path.expanduser("~/.cache/clawdbot-parallel")
+SIZE_LIMIT = 512 * 1024 * 1024  # 512 MB
+
+_cache = None
+
+
+def _get_cache():
+    global _cache
+    if _cache is None and diskcache is not None:
+        _cache = diskcache.Cache(
+            CACHE_DIR,
+            size_limit=SIZE_LIMIT,
+            eviction_policy="least-recently-used",
+        )
+    return _cache
+
+
+def make_key(processor, input_data, task_spec, include_domains, exclude_domains) -> str:
+    """Deterministic key for a task request payload."""
+    payload = json.dumps(
+        {
+            "processor": processor,
+            "input": input_data,
+            "task_spec": task_spec,
+            "include": include_domains,
+            "exclude": exclude_domains,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode()).hexdigest()
+
+
+def cache_get(key: str):
+    """Return the cached value for key, or None on miss / no diskcache."""
+    cache = _get_cache()
+    return cache.get(key) if cache is not None else None
+
+
+def cache_put(key: str, value, ttl: float = None):
+    """Store value under key, optionally expiring after ttl seconds."""
+    cache = _get_cache()
+    if cache is not None:
+        cache.set(key, value, expire=ttl)
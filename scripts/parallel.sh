@@ -4,12 +4,20 @@
 
 set -e
 
-API_KEY="${PARALLEL_API_KEY:-y2s_m4er5i6-5qCikOLUtmnkvOYRU24eDphq_jg1}"
+API_KEY="${PARALLEL_API_KEY:-}"
 BASE_URL="https://api.parallel.ai/v1"
 MAX_WAIT="${PARALLEL_MAX_WAIT:-120}"
 
+require_key() {
+  if [ -z "$API_KEY" ]; then
+    echo "❌ PARALLEL_API_KEY is not set" >&2
+    exit 2
+  fi
+}
+
 # Submit task and poll for result
 run_task() {
+  require_key
   local input="$1"
   local processor="${2:-base}"
   
@@ -87,6 +95,7 @@ case "$command" in
   status)
     RUN_ID="$1"
     [ -z "$RUN_ID" ] && { echo "Usage: parallel.sh status <run_id>" >&2; exit 1; }
+    require_key
     curl -s -X GET "$BASE_URL/tasks/runs/$RUN_ID" \
       -H "x-api-key: $API_KEY" | jq '.'
     ;;
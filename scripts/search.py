@@ -11,7 +11,7 @@ import argparse
 
 from parallel import Parallel
 
-API_KEY = os.environ.get("PARALLEL_API_KEY", "y2s_m4er5i6-5qCikOLUtmnkvOYRU24eDphq_jg1")
+API_KEY = os.environ.get("PARALLEL_API_KEY")
 
 def search(objective: str, max_results: int = 10, mode: str = "one-shot"):
     """Search using Parallel SDK."""
@@ -59,7 +59,12 @@ def main():
     if not args.query:
         parser.print_help()
         sys.exit(1)
-    
+
+    if not API_KEY:
+        print("Error: PARALLEL_API_KEY environment variable is not set",
+              file=sys.stderr)
+        sys.exit(2)
+
     query = " ".join(args.query)
     response = search(query, max_results=args.max_results, mode=args.mode)
     
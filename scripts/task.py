@@ -12,15 +12,55 @@ Usage:
   python3 task.py "Extract migration docs from https://nxp.com/products/K66_180"
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import json
 import argparse
+import atexit
+import csv
+import functools
+import hmac
+import io
+import secrets
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse
+
+# C-accelerated serializer for large report/basis payloads; stdlib
+# fallback keeps it optional (same pattern as diskcache in _cache.py)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The parallel SDK (and its pydantic/httpx tree) is imported lazily in
+# main so --help, usage errors and --no-wait checks don't pay for it
 
-from parallel import Parallel
+API_KEY = os.environ.get("PARALLEL_API_KEY")
+BASE_URL = "https://api.parallel.ai"
 
-API_KEY = os.environ.get("PARALLEL_API_KEY", "y2s_m4er5i6-5qCikOLUtmnkvOYRU24eDphq_jg1")
+_HTTP = None
+
+
+def _http_client():
+    """Build (once) the shared keep-alive transport.
+
+    Repeated retrieves reuse one TCP+TLS connection instead of
+    handshaking per request; the pool is closed at exit.
+    """
+    global _HTTP
+    if _HTTP is None:
+        import httpx
+        _HTTP = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=10,
+                                max_connections=20, keepalive_expiry=90),
+            timeout=30,
+        )
+        atexit.register(_HTTP.close)
+    return _HTTP
 
 
 def create_task(
@@ -31,15 +71,20 @@ def create_task(
     include_domains: list = None,
     exclude_domains: list = None,
     mcp_servers: list = None,
+    webhook: dict = None,
 ) -> dict:
     """Create and run a task."""
     params = {
         "input": input_data,
         "processor": processor,
     }
-    
+
     if task_spec:
         params["task_spec"] = task_spec
+
+    # Push-notification callback: {"url": ..., "token": ...}
+    if webhook:
+        params["webhook"] = webhook
     
     # Source policy
     if include_domains or exclude_domains:
@@ -60,47 +105,203 @@ def create_task(
     return task_run
 
 
-def poll_task(client: Parallel, run_id: str, timeout: int = 300) -> dict:
-    """Poll until task completes."""
-    start = time.time()
-    while time.time() - start < timeout:
+def poll_task(
+    client: Parallel,
+    run_id: str,
+    timeout: int = 300,
+    initial_interval: float = 0.25,
+    max_interval: float = 10.0,
+    backoff_factor: float = 1.5,
+) -> dict:
+    """Poll until task completes, backing off exponentially between retrieves.
+
+    Starts at initial_interval and multiplies by backoff_factor up to
+    max_interval, so fast tasks are detected quickly and long-running ones
+    don't hammer the API. The interval resets whenever the run status
+    changes (e.g. queued -> running).
+    """
+    # monotonic deadline: immune to wall-clock jumps (NTP, DST)
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    prev_status = None
+    while time.monotonic() < deadline:
         result = client.beta.task_run.retrieve(run_id)
-        if result.run.status == "completed":
+        status = result.run.status
+        if status == "completed":
             return result
-        elif result.run.status == "failed":
+        elif status == "failed":
             raise Exception(f"Task failed: {result.run}")
-        time.sleep(2)
+        if status != prev_status:
+            interval = initial_interval
+            prev_status = status
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(interval, remaining))
+        interval = min(interval * backoff_factor, max_interval)
     raise TimeoutError(f"Task {run_id} did not complete within {timeout}s")
 
 
-def build_enrichment_spec(input_fields: str, output_fields: str) -> tuple:
-    """Build input/output schemas for enrichment."""
-    # Parse input: "company_name=Stripe,website=stripe.com"
+def stream_task(client: Parallel, run_id: str, timeout: int = 300) -> dict:
+    """Follow the run's SSE event stream until a terminal status.
+
+    One long-lived connection replaces the poll loop; only a single final
+    retrieve fetches the full output. Raises httpx.HTTPError if the
+    server doesn't support event streams, so callers can fall back to
+    poll_task.
+
+    The timeout is a hard deadline, not a per-read idle limit: progress
+    or heartbeat events don't extend it.
+    """
+    import httpx
+    deadline = time.monotonic() + timeout
+    url = f"{BASE_URL}/v1beta/tasks/runs/{run_id}/events"
+    headers = {"x-api-key": API_KEY, "Accept": "text/event-stream"}
+    # The read timeout is per read, so it must not get the whole budget:
+    # a late event would reset it and allow ~2x --timeout of idle wait.
+    # A capped idle window trips httpx.ReadTimeout instead, and main
+    # polls out the remaining budget.
+    read_timeout = min(timeout, 30.0)
+    with _http_client().stream("GET", url, headers=headers,
+                               timeout=httpx.Timeout(30, read=read_timeout)) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"Task {run_id} did not complete within {timeout}s")
+            if not line.startswith("data:"):
+                continue
+            try:
+                event = json.loads(line[len("data:"):].strip())
+            except ValueError:
+                continue
+            status = event.get("status") or event.get("run", {}).get("status")
+            if status == "completed":
+                return client.beta.task_run.retrieve(run_id)
+            elif status == "failed":
+                raise Exception(f"Task failed: {event}")
+    # Stream closed cleanly without a terminal event (e.g. an LB idle
+    # timeout); raise an httpx error so main falls back to polling
+    raise httpx.RemoteProtocolError(
+        f"Task {run_id} event stream ended before a terminal event")
+
+
+class _WebhookListener:
+    """One-shot HTTP listener for task-completion callbacks.
+
+    Binds a local HTTPServer on the given port and signals an event the
+    caller blocks on. The shared token is verified with a constant-time
+    compare before the payload is trusted, and only a POST carrying a
+    terminal status releases the waiter — early or progress callbacks
+    are acknowledged but keep the listener open.
+    """
+
+    def __init__(self, port: int, token: str):
+        self.token = token
+        self.event = threading.Event()
+        self.payload = None
+        listener = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                sent = self.headers.get("X-Webhook-Token", "")
+                if not hmac.compare_digest(sent, listener.token):
+                    self.send_response(403)
+                    self.end_headers()
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    payload = None
+                self.send_response(200)
+                self.end_headers()
+                status = ((payload or {}).get("status")
+                          or (payload or {}).get("run", {}).get("status"))
+                if status in ("completed", "failed"):
+                    listener.payload = payload
+                    listener.event.set()
+
+            def log_message(self, format, *args):
+                pass  # keep stderr clean
+
+        self.server = HTTPServer(("0.0.0.0", port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the callback POST arrives or timeout elapses."""
+        try:
+            return self.event.wait(timeout)
+        finally:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def wait_for_task(client: Parallel, run_id: str, listener: _WebhookListener,
+                  timeout: int = 300) -> dict:
+    """Block on the webhook callback, then retrieve the full result.
+
+    The callback gets half the timeout budget; if it never arrives (e.g.
+    the public URL isn't reachable from Parallel's side) the polling
+    fallback runs with whatever is left, so the whole wait never exceeds
+    the one timeout. A result is only returned once the run is actually
+    terminal — a premature callback falls through to polling rather
+    than handing back (and caching) an incomplete result.
+    """
+    deadline = time.monotonic() + timeout
+    if listener.wait(timeout / 2):
+        result = client.beta.task_run.retrieve(run_id)
+        status = result.run.status
+        if status == "completed":
+            return result
+        elif status == "failed":
+            raise Exception(f"Task failed: {result.run}")
+        # Callback fired but the run isn't terminal server-side yet;
+        # poll out the remainder instead of returning early
+    else:
+        print("⚠️  No webhook callback received, falling back to polling",
+              file=sys.stderr)
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError(f"Task {run_id} did not complete within {timeout}s")
+    return poll_task(client, run_id, timeout=remaining)
+
+
+def _parse_input(input_fields: str) -> dict:
+    """Parse "company_name=Stripe,website=stripe.com" into a dict."""
     input_data = {}
-    input_props = {}
     for pair in input_fields.split(","):
         if "=" in pair:
             key, val = pair.split("=", 1)
             input_data[key.strip()] = val.strip()
-            input_props[key.strip()] = {"type": "string"}
-    
-    # Parse output: "founding_year,employee_count,funding"
-    output_props = {}
-    for field in output_fields.split(","):
-        field = field.strip()
-        if field:
-            output_props[field] = {
-                "type": "string",
-                "description": f"The {field.replace('_', ' ')} of the entity"
-            }
-    
-    task_spec = {
+    return input_data
+
+
+@functools.lru_cache(maxsize=256)
+def _build_spec(input_keys: tuple, output_keys: tuple) -> dict:
+    """Build the task_spec for a given set of input/output field names.
+
+    The spec is a pure function of the field names, so it's memoized —
+    batch enrichment loops hit the same schema per record.
+    """
+    input_props = {key: {"type": "string"} for key in input_keys}
+    output_props = {
+        field: {
+            "type": "string",
+            "description": f"The {field.replace('_', ' ')} of the entity"
+        }
+        for field in output_keys
+    }
+
+    return {
         "input_schema": {
             "type": "json",
             "json_schema": {
                 "type": "object",
                 "properties": input_props,
-                "required": list(input_props.keys()),
+                "required": list(input_keys),
                 "additionalProperties": False
             }
         },
@@ -109,59 +310,328 @@ def build_enrichment_spec(input_fields: str, output_fields: str) -> tuple:
             "json_schema": {
                 "type": "object",
                 "properties": output_props,
-                "required": list(output_props.keys()),
+                "required": list(output_keys),
                 "additionalProperties": False
             }
         }
     }
-    
+
+
+def build_enrichment_spec(input_fields: str, output_fields: str) -> tuple:
+    """Build input/output schemas for enrichment."""
+    input_data = _parse_input(input_fields)
+    output_keys = tuple(sorted(
+        field.strip() for field in output_fields.split(",") if field.strip()
+    ))
+    task_spec = _build_spec(tuple(sorted(input_data)), output_keys)
     return input_data, task_spec
 
 
+def _dumps(obj, indent: bool = False) -> str:
+    """Serialize obj to JSON, using orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option, default=str).decode()
+    return json.dumps(obj, indent=2 if indent else None, default=str)
+
+
+def _read_records(path: str) -> list:
+    """Load enrichment rows from a CSV (with header) or JSONL file."""
+    records = []
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                records.append({k.strip(): (v or "").strip() for k, v in row.items()})
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+    return records
+
+
+def poll_many(client: Parallel, run_ids: list, timeout: int = 300,
+              initial_interval: float = 1.0, max_interval: float = 10.0,
+              backoff_factor: float = 1.5):
+    """Poll a set of runs round-robin, yielding (run_id, result) as each
+    finishes. Failed runs are yielded too; callers check run.status."""
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    pending = list(run_ids)
+    while pending and time.monotonic() < deadline:
+        still_pending = []
+        for run_id in pending:
+            result = client.beta.task_run.retrieve(run_id)
+            if result.run.status in ("completed", "failed"):
+                yield run_id, result
+            else:
+                still_pending.append(run_id)
+        pending = still_pending
+        remaining = deadline - time.monotonic()
+        if pending and remaining > 0:
+            time.sleep(min(interval, remaining))
+            interval = min(interval * backoff_factor, max_interval)
+    if pending:
+        raise TimeoutError(f"{len(pending)} tasks did not complete within {timeout}s")
+
+
+async def poll_task_async(http, run_id: str, deadline: float,
+                          initial_interval: float = 1.0,
+                          max_interval: float = 10.0,
+                          backoff_factor: float = 1.5) -> dict:
+    """Async-poll one run over a shared AsyncClient until terminal.
+
+    Hits the REST retrieve endpoint directly and returns a dict shaped
+    like the SDK's retrieve response ({"run": ..., "output": ...}) so
+    result_to_dict/format_result apply unchanged. Failed runs are
+    returned, not raised; callers check the status field.
+    """
+    import asyncio
+    headers = {"x-api-key": API_KEY}
+    interval = initial_interval
+    while time.monotonic() < deadline:
+        response = await http.get(f"{BASE_URL}/v1/tasks/runs/{run_id}",
+                                  headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        status = data.get("status")
+        if status == "failed":
+            return {"run": data, "output": data.get("output")}
+        if status == "completed":
+            # The status poll may omit output (parallel.sh handles the
+            # same gap on this endpoint); fetch the full result once
+            # terminal, like stream_task's final retrieve
+            response = await http.get(
+                f"{BASE_URL}/v1/tasks/runs/{run_id}/result", headers=headers)
+            response.raise_for_status()
+            result = response.json()
+            if "run" in result:
+                return result
+            return {"run": data, "output": result.get("output", result)}
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * backoff_factor, max_interval)
+    raise TimeoutError(f"Task {run_id} did not complete in time")
+
+
+async def _poll_all(runs: dict, timeout: int):
+    """Poll all runs concurrently, printing NDJSON as each completes.
+
+    N independent tasks finish in max(t_i) instead of paying the poll
+    overhead serially per run.
+    """
+    import asyncio
+    import httpx
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=10,
+                                max_connections=20, keepalive_expiry=90),
+            timeout=30) as http:
+
+        async def one(run_id):
+            return run_id, await poll_task_async(http, run_id, deadline)
+
+        for future in asyncio.as_completed([one(run_id) for run_id in runs]):
+            run_id, result = await future
+            line = {"input": runs[run_id]}
+            line.update(result_to_dict(result))
+            print(_dumps(line), flush=True)
+
+
+def run_enrich_file(client: Parallel, path: str, output_fields: str,
+                    processor: str = "core", timeout: int = 300):
+    """Enrich every row of a CSV/JSONL file in one process.
+
+    All runs are created up-front over the shared pooled client (one TLS
+    handshake and one Python start-up for N rows instead of N of each),
+    then polled as a group. Results are printed to stdout as NDJSON in
+    completion order, each line carrying the originating row.
+    """
+    records = _read_records(path)
+    if not records:
+        raise ValueError(f"No records found in {path}")
+
+    output_keys = tuple(sorted(
+        field.strip() for field in output_fields.split(",") if field.strip()
+    ))
+
+    runs = {}  # run_id -> input row
+    for record in records:
+        task_spec = _build_spec(tuple(sorted(record)), output_keys)
+        task_run = create_task(client, record, processor=processor,
+                               task_spec=task_spec)
+        run_id = task_run.run.run_id if hasattr(task_run, 'run') else task_run.run_id
+        runs[run_id] = record
+
+    print(f"⏳ Running {len(runs)} enrichment tasks...", file=sys.stderr)
+    if len(runs) > 1:
+        # Concurrent async polling; completion order, not input order
+        import asyncio
+        asyncio.run(_poll_all(runs, timeout))
+    else:
+        for run_id, result in poll_many(client, list(runs), timeout=timeout):
+            line = {"input": runs[run_id]}
+            line.update(result_to_dict(result))
+            print(_dumps(line), flush=True)
+
+
+def _normalize(result) -> dict:
+    """Dump an SDK result model to a plain dict, once.
+
+    Everything downstream (format_result, the --json printer) reads this
+    dict with .get() instead of reflecting over pydantic attributes per
+    field, so the model conversion happens at one boundary.
+    """
+    if isinstance(result, dict):
+        return result
+    if hasattr(result, "model_dump"):
+        return result.model_dump(exclude_none=True)
+    return vars(result)
+
+
+def result_to_dict(result) -> dict:
+    """Convert a task result into a plain JSON-serializable dict."""
+    data = _normalize(result)
+    run = data.get("run", {})
+    out = data.get("output") or {}
+    output = {
+        "run_id": run.get("run_id"),
+        "status": run.get("status"),
+        "processor": run.get("processor"),
+    }
+    if out:
+        output["output"] = {
+            "type": out.get("type"),
+            "content": out.get("content"),
+        }
+        basis = out.get("basis")
+        if basis:
+            output["basis"] = [
+                {
+                    "field": b.get("field"),
+                    "confidence": b.get("confidence"),
+                    "citations": [
+                        {"title": c.get("title"), "url": c.get("url")}
+                        for c in b.get("citations", [])
+                    ]
+                }
+                for b in basis
+            ]
+    return output
+
+
+class _Truncated(Exception):
+    pass
+
+
+class _LimitedWriter(io.StringIO):
+    """StringIO that raises _Truncated once more than limit chars are written."""
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+
+    def write(self, s):
+        written = super().write(s)
+        if self.tell() > self.limit:
+            raise _Truncated
+        return written
+
+
+def _truncate(v, n: int = 200) -> str:
+    """Render v as a display string of at most n chars (plus ellipsis).
+
+    Strings are sliced before any copy is made, and dicts/lists are
+    serialized incrementally and cut off once the writer passes n chars,
+    so a huge value never fully materializes just to be thrown away.
+    """
+    if isinstance(v, str):
+        return v[:n] + "..." if len(v) > n else v
+    if isinstance(v, (dict, list)):
+        buf = _LimitedWriter(n)
+        try:
+            json.dump(v, buf, default=str)
+        except _Truncated:
+            return buf.getvalue()[:n] + "..."
+        return buf.getvalue()
+    val_str = str(v)
+    return val_str[:n] + "..." if len(val_str) > n else val_str
+
+
 def format_result(result) -> str:
     """Format task result for display."""
-    output = []
-    
-    run = result.run
-    output.append(f"🔬 Task: {run.run_id}")
-    output.append(f"   Status: {run.status} | Processor: {run.processor}")
-    output.append("")
-    
-    if hasattr(result, 'output') and result.output:
-        content = result.output.content
-        output_type = result.output.type
-        
+    data = _normalize(result)
+    run = data.get("run", {})
+
+    # Write lines straight into one buffer rather than accumulating a
+    # list of small strings and joining at the end
+    buf = io.StringIO()
+    buf.write(f"🔬 Task: {run.get('run_id')}\n")
+    buf.write(f"   Status: {run.get('status')} | Processor: {run.get('processor')}\n")
+    buf.write("\n")
+
+    out = data.get("output")
+    if out:
+        content = out.get("content")
+        output_type = out.get("type")
+
         if output_type == "json" and isinstance(content, dict):
-            output.append("**Results:**")
+            buf.write("**Results:**\n")
             for key, val in content.items():
-                # Truncate long values
-                val_str = str(val)
-                if len(val_str) > 200:
-                    val_str = val_str[:200] + "..."
-                output.append(f"  • {key}: {val_str}")
+                buf.write(f"  • {key}: {_truncate(val)}\n")
         elif output_type == "text":
-            output.append("**Report:**")
-            output.append(content[:2000] + "..." if len(content) > 2000 else content)
+            buf.write("**Report:**\n")
+            buf.write(_truncate(content, 2000) + "\n")
         else:
-            output.append(f"**Output ({output_type}):**")
-            output.append(str(content)[:2000])
-        
+            buf.write(f"**Output ({output_type}):**\n")
+            buf.write(_truncate(content, 2000) + "\n")
+
         # Show basis/citations if available
-        if hasattr(result.output, 'basis') and result.output.basis:
-            output.append("")
-            output.append("**Citations:**")
-            for basis in result.output.basis[:5]:  # Limit to 5
-                field = basis.field if hasattr(basis, 'field') else 'result'
-                confidence = basis.confidence if hasattr(basis, 'confidence') else 'unknown'
-                output.append(f"  [{field}] confidence: {confidence}")
-                if hasattr(basis, 'citations'):
-                    for cite in basis.citations[:2]:
-                        output.append(f"    - {cite.title}: {cite.url}")
-    
-    return "\n".join(output)
+        if out.get("basis"):
+            buf.write("\n**Citations:**\n")
+            for basis in out["basis"][:5]:  # Limit to 5
+                field = basis.get("field", "result")
+                confidence = basis.get("confidence", "unknown")
+                buf.write(f"  [{field}] confidence: {confidence}\n")
+                for cite in basis.get("citations", [])[:2]:
+                    buf.write(f"    - {cite.get('title')}: {cite.get('url')}\n")
 
+    # drop the trailing newline; print() adds its own
+    return buf.getvalue()[:-1]
 
-def main():
+
+@functools.lru_cache(maxsize=4)
+def _mcp_template(key: str) -> list:
+    """Build (once per key) the browser-use MCP server config.
+
+    The config is invariant for a given API key, so repeated main()
+    calls in library/batch mode reuse the same list instead of
+    re-formatting the Authorization header each time.
+    """
+    return [{
+        "type": "url",
+        "url": "https://api.browser-use.com/mcp",
+        "name": "browseruse",
+        "headers": {"Authorization": f"Bearer {key}"}
+    }]
+
+
+def _parse_domains(value: str) -> list:
+    """Parse a comma-separated domain list into a sorted, deduped list."""
+    if not value:
+        return None
+    return sorted({d for d in (s.strip() for s in value.split(",")) if d}) or None
+
+
+@functools.lru_cache(maxsize=1)
+def _parser() -> argparse.ArgumentParser:
+    """Build (once) the CLI argument parser.
+
+    Cached so harnesses that import this module and call main() in a
+    loop don't rebuild the add_argument metadata every invocation.
+    """
     parser = argparse.ArgumentParser(description="Parallel.ai Task API")
     parser.add_argument("query", nargs="*", help="Research query or question")
     parser.add_argument("--processor", "-p", default="core", 
@@ -169,6 +639,9 @@ def main():
                        help="Processor tier (base=fast, core=standard, ultra=deep)")
     parser.add_argument("--enrich", "-e", metavar="FIELDS",
                        help="Enrichment mode: key=value pairs (e.g., 'company_name=Stripe,website=stripe.com')")
+    parser.add_argument("--enrich-file", metavar="PATH",
+                       help="Bulk enrichment: CSV or JSONL file of input rows; "
+                            "results stream to stdout as NDJSON")
     parser.add_argument("--output", "-o", metavar="FIELDS",
                        help="Output fields for enrichment (e.g., 'founding_year,employee_count')")
     parser.add_argument("--report", "-r", action="store_true",
@@ -179,17 +652,48 @@ def main():
                        help="Comma-separated domains to exclude")
     parser.add_argument("--browseruse-key", metavar="KEY",
                        help="browser-use.com API key for authenticated page access")
+    parser.add_argument("--webhook-url", metavar="URL",
+                       default=os.environ.get("PARALLEL_WEBHOOK_URL"),
+                       help="Public URL for completion callbacks; waits on a push "
+                            "notification instead of polling (env: PARALLEL_WEBHOOK_URL)")
     parser.add_argument("--timeout", "-t", type=int, default=300,
                        help="Timeout in seconds (default: 300)")
     parser.add_argument("--json", "-j", action="store_true",
                        help="Output raw JSON")
     parser.add_argument("--no-wait", action="store_true",
                        help="Don't wait for completion, just return run_id")
-    
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Bypass the on-disk result cache")
+    parser.add_argument("--cache-ttl", type=float, metavar="SECONDS",
+                       help="Expire cached results after this many seconds")
+    return parser
+
+
+def main():
+    parser = _parser()
     args = parser.parse_args()
-    
-    client = Parallel(api_key=API_KEY)
-    
+
+    # Fail fast on missing credentials, before any import or network I/O
+    if not API_KEY:
+        print("Error: PARALLEL_API_KEY environment variable is not set",
+              file=sys.stderr)
+        sys.exit(2)
+
+    # Bulk enrichment: one process, one client, N runs polled as a group
+    if args.enrich_file:
+        if not args.output:
+            print("Error: --enrich-file requires --output fields", file=sys.stderr)
+            sys.exit(1)
+        from parallel import Parallel
+        client = Parallel(api_key=API_KEY, http_client=_http_client())
+        try:
+            run_enrich_file(client, args.enrich_file, args.output,
+                            processor=args.processor, timeout=args.timeout)
+        except Exception as e:
+            print(f"❌ Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
     # Determine input and task spec
     input_data = None
     task_spec = None
@@ -215,25 +719,51 @@ def main():
             sys.exit(1)
         input_data = query
     
-    # Parse domain filters
-    include_domains = None
-    exclude_domains = None
-    if args.include_domains:
-        include_domains = [d.strip() for d in args.include_domains.split(",")]
-    if args.exclude_domains:
-        exclude_domains = [d.strip() for d in args.exclude_domains.split(",")]
+    # Parse domain filters: dedupe, drop empties, and sort so equivalent
+    # inputs ("a.com,b.com" vs "b.com,,a.com,") produce identical request
+    # bodies and cache keys
+    include_domains = _parse_domains(args.include_domains)
+    exclude_domains = _parse_domains(args.exclude_domains)
     
     # Build MCP servers for authenticated browsing
     mcp_servers = None
     browseruse_key = args.browseruse_key or os.environ.get("BROWSERUSE_API_KEY")
     if browseruse_key:
-        mcp_servers = [{
-            "type": "url",
-            "url": "https://api.browser-use.com/mcp",
-            "name": "browseruse",
-            "headers": {"Authorization": f"Bearer {browseruse_key}"}
-        }]
+        mcp_servers = _mcp_template(browseruse_key)
     
+    # Result cache: identical queries short-circuit to the prior result
+    # before the SDK is even imported, so hits cost milliseconds.
+    # Skipped for authenticated (MCP) runs since those can return
+    # session-specific content.
+    cache_key = None
+    if not args.no_cache and not args.no_wait and not mcp_servers:
+        from _cache import make_key, cache_get, cache_put
+        cache_key = make_key(processor, input_data, task_spec,
+                             include_domains, exclude_domains)
+        cached = cache_get(cache_key)
+        if cached is not None:
+            if args.json:
+                print(_dumps(cached["json"], indent=True))
+            else:
+                print(cached["formatted"])
+            return
+
+    # Cache miss (or caching off): now pay for the SDK import tree
+    import httpx
+    from parallel import Parallel
+
+    client = Parallel(api_key=API_KEY, http_client=_http_client())
+
+    # Webhook mode: listen locally and have Parallel push the completion
+    # event instead of polling for it
+    webhook = None
+    listener = None
+    if args.webhook_url and not args.no_wait:
+        port = urlparse(args.webhook_url).port or 8765
+        token = secrets.token_hex(16)
+        listener = _WebhookListener(port, token)
+        webhook = {"url": args.webhook_url, "token": token}
+
     # Create task
     try:
         task_run = create_task(
@@ -244,43 +774,42 @@ def main():
             include_domains=include_domains,
             exclude_domains=exclude_domains,
             mcp_servers=mcp_servers,
+            webhook=webhook,
         )
-        
+
         run_id = task_run.run.run_id if hasattr(task_run, 'run') else task_run.run_id
-        
+
         if args.no_wait:
             print(f"Task created: {run_id}")
             return
-        
-        # Poll for completion
+
+        # Wait for completion (push if a webhook is registered, else poll)
         print(f"⏳ Running task {run_id}...", file=sys.stderr)
-        result = poll_task(client, run_id, timeout=args.timeout)
+        if listener:
+            result = wait_for_task(client, run_id, listener, timeout=args.timeout)
+        else:
+            # One deadline spans the stream attempt and any polling
+            # fallback, so the whole wait honors a single --timeout
+            deadline = time.monotonic() + args.timeout
+            try:
+                result = stream_task(client, run_id, timeout=args.timeout)
+            except httpx.HTTPError:
+                # Event stream unsupported or dropped; poll out the
+                # remaining budget
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Task {run_id} did not complete within {args.timeout}s")
+                result = poll_task(client, run_id, timeout=remaining)
         
+        if cache_key is not None:
+            cache_put(cache_key, {
+                "json": result_to_dict(result),
+                "formatted": format_result(result),
+            }, ttl=args.cache_ttl)
+
         if args.json:
-            # Convert to dict for JSON output
-            output = {
-                "run_id": result.run.run_id,
-                "status": result.run.status,
-                "processor": result.run.processor,
-            }
-            if hasattr(result, 'output') and result.output:
-                output["output"] = {
-                    "type": result.output.type,
-                    "content": result.output.content,
-                }
-                if hasattr(result.output, 'basis'):
-                    output["basis"] = [
-                        {
-                            "field": b.field if hasattr(b, 'field') else None,
-                            "confidence": b.confidence if hasattr(b, 'confidence') else None,
-                            "citations": [
-                                {"title": c.title, "url": c.url}
-                                for c in (b.citations if hasattr(b, 'citations') else [])
-                            ]
-                        }
-                        for b in result.output.basis
-                    ]
-            print(json.dumps(output, indent=2, default=str))
+            print(_dumps(result_to_dict(result), indent=True))
         else:
             print(format_result(result))
             